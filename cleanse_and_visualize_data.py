@@ -1,17 +1,36 @@
+import glob
+import os
 import subprocess
+import sys
 
-def run_scripts():
-    try:
-        print("Running data_cleansing.py...")
-        subprocess.run(["python", "data_cleansing.py"], check=True)
+def run_scripts(match_files):
+    """Clean and plot every given match file from matches/ into matches/cleaned/."""
+    if not match_files:
+        print("No match files found, nothing to clean or plot. Record a match with tracker.py first.")
+        return
 
-        print("Running visualize_scores_styled.py...")
-        subprocess.run(["python", "visualize_scores_styled.py"], check=True)
+    output_dir = os.path.join(os.path.dirname(match_files[0]), "cleaned")
+    os.makedirs(output_dir, exist_ok=True)
 
-        print("Both scripts executed successfully.")
-    except subprocess.CalledProcessError as e:
-        print(f"An error occurred while executing {e.cmd}:")
-        print(e)
+    for match_file in match_files:
+        base = os.path.splitext(match_file)[0]
+        name = os.path.basename(base)
+        cleaned_file = os.path.join(output_dir, f"{name}_cleaned.csv")
+        image_file = os.path.join(output_dir, f"{name}.png")
+        try:
+            print(f"Running data_cleansing.py on {match_file}...")
+            subprocess.run(["python", "data_cleansing.py", match_file, cleaned_file], check=True)
+
+            # The match's .json file carries the map and teams that were set when it was played
+            print("Running visualize_scores_styled.py...")
+            subprocess.run(["python", "visualize_scores_styled.py", cleaned_file, image_file, f"{base}.json"], check=True)
+        except subprocess.CalledProcessError as e:
+            print(f"An error occurred while executing {e.cmd}:")
+            print(e)
+
+    print(f"Processed {len(match_files)} match(es), results are in '{output_dir}/'.")
 
 if __name__ == "__main__":
-    run_scripts()
\ No newline at end of file
+    # Match files can be passed explicitly, otherwise every match recorded in matches/ is processed
+    match_files = sys.argv[1:] if len(sys.argv) > 1 else sorted(glob.glob(os.path.join("matches", "*.csv")))
+    run_scripts(match_files)
@@ -2,14 +2,32 @@ import csv
 import pandas as pd
 import numpy as np
 import os
+import sys
 from datetime import datetime
+from render_prep import ELAPSED_COL
 
-def clean_cod_hardpoint_data(input_file="score_log.csv", output_file="cleaned_score_log.csv"):
+RESAMPLE_INTERVAL = 1.0  # Seconds between rows in the cleaned data
+MAX_REASONABLE_JUMP = 10  # Maximum reasonable score jump per second
+
+def timestamps_to_seconds(timestamps):
+    """
+    Convert a timestamp column to float seconds. Numeric values are taken as
+    epoch seconds, anything else is parsed as a date string.
+    """
+    numeric = pd.to_numeric(timestamps, errors='coerce')
+    if numeric.notna().any():
+        return numeric.astype(float)
+    parsed = pd.to_datetime(timestamps, errors='coerce')
+    return (parsed - pd.Timestamp("1970-01-01")).dt.total_seconds()
+
+def clean_cod_hardpoint_data(input_file="score_log.csv", output_file="cleaned_score_log.csv", resample_interval=RESAMPLE_INTERVAL, backup=True):
     """
     Clean Call of Duty Hardpoint scoreboard data:
     1. Remove all data before the last 0,0 reading (match start)
     2. Truncate data after first 250 or last 249 score
-    3. Smooth data to eliminate outliers and ensure logical score progression
+    3. Fill missing readings and ensure scores never decrease
+    4. Resample onto a uniform time grid (forward filling scores) and add an elapsed seconds column
+    5. Smooth data to eliminate outliers
     """
     print(f"Reading data from {input_file}...")
     
@@ -24,9 +42,10 @@ def clean_cod_hardpoint_data(input_file="score_log.csv", output_file="cleaned_sc
         return
     
     # Make a backup of original data
-    backup_file = f"original_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.path.basename(input_file)}"
-    df.to_csv(backup_file, index=False)
-    print(f"Original data backed up to {backup_file}")
+    if backup:
+        backup_file = f"original_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.path.basename(input_file)}"
+        df.to_csv(backup_file, index=False)
+        print(f"Original data backed up to {backup_file}")
     
     # Print column names to debug
     print(f"CSV columns: {df.columns.tolist()}")
@@ -57,84 +76,84 @@ def clean_cod_hardpoint_data(input_file="score_log.csv", output_file="cleaned_sc
     if team2_col:
         print(f"Team 2 score range: {df[team2_col].min()} - {df[team2_col].max()}")
     
+    # Convert timestamps to seconds. New logs store epoch seconds, older ones "%Y-%m-%d %H:%M:%S" strings
+    seconds = timestamps_to_seconds(df[timestamp_col])
+    df = df.assign(**{timestamp_col: seconds})
+    df = df[seconds.notna()].sort_values(timestamp_col, kind="stable").reset_index(drop=True)
+
+    def score_equals(col, value):
+        if not col:
+            return np.zeros(len(df), dtype=bool)
+        return (df[col] == value).to_numpy()
+
     # Step 0: Find the last occurrence where both teams have a score of 0
-    last_zero_index = -1
-    
-    for i in range(len(df)-1, -1, -1):
-        team1_score = df.iloc[i][team1_col] if team1_col else None
-        team2_score = df.iloc[i][team2_col] if team2_col else None
-        
-        if (pd.notna(team1_score) and team1_score == 0 and 
-            pd.notna(team2_score) and team2_score == 0):
-            last_zero_index = i
-            break
+    zero_rows = np.flatnonzero(score_equals(team1_col, 0) & score_equals(team2_col, 0))
     
     # Truncate the dataframe to remove pre-game data
-    if last_zero_index != -1:
-        df = df.iloc[last_zero_index:]
+    if len(zero_rows):
+        last_zero_index = zero_rows[-1]
+        df = df.iloc[last_zero_index:].reset_index(drop=True)
         print(f"Pre-game data removed: Starting from row {last_zero_index} where last 0,0 score was found")
     else:
         print("No 0,0 score found. Using all data.")
     
     # Step 1: Truncate data after first 250 or last 249
     max_score_index = -1
-    for i, row in df.iterrows():
-        team1_score = row[team1_col] if team1_col else None
-        team2_score = row[team2_col] if team2_col else None
-        
-        # Check if either team has reached 250
-        if (pd.notna(team1_score) and team1_score == 250) or (pd.notna(team2_score) and team2_score == 250):
-            max_score_index = i
-            break
-    
-    # If no 250 found, check for last 249
-    if max_score_index == -1:
-        for i in range(len(df)-1, -1, -1):
-            team1_score = df.iloc[i][team1_col] if team1_col else None
-            team2_score = df.iloc[i][team2_col] if team2_col else None
-            
-            if (pd.notna(team1_score) and team1_score == 249) or (pd.notna(team2_score) and team2_score == 249):
-                max_score_index = i
-                break
+    winning_rows = np.flatnonzero(score_equals(team1_col, 250) | score_equals(team2_col, 250))
+    if len(winning_rows):
+        max_score_index = winning_rows[0]
+    else:
+        # If no 250 found, check for last 249
+        near_winning_rows = np.flatnonzero(score_equals(team1_col, 249) | score_equals(team2_col, 249))
+        if len(near_winning_rows):
+            max_score_index = near_winning_rows[-1]
     
     # Truncate the dataframe if needed
     if max_score_index != -1:
         df = df.iloc[:max_score_index+1]
         print(f"Data truncated at index {max_score_index} where a team reached winning score")
     
-    # Step 2: Smooth out data and fix outliers
+    if df.empty:
+        print("Error: No samples left after truncation.")
+        return
+    
+    # Step 2: Fix missing values and ensure scores never decrease
+    def fill_team_scores(scores):
+        # A missing or decreased reading takes the last valid score (0 before the first one)
+        return scores.ffill().fillna(0).cummax().to_numpy()
+    
+    # Step 3: Resample onto a uniform time grid so one row is resample_interval seconds
+    elapsed = (df[timestamp_col] - df[timestamp_col].iloc[0]).to_numpy()
+    grid = np.arange(0, elapsed[-1] + resample_interval / 2, resample_interval)
+    # Index of the latest sample at or before each grid point (forward fill)
+    source_rows = np.searchsorted(elapsed, grid, side="right") - 1
+    
+    resampled = pd.DataFrame({timestamp_col: df[timestamp_col].iloc[0] + grid})
+    if team1_col:
+        resampled[team1_col] = fill_team_scores(df[team1_col])[source_rows]
+    if team2_col:
+        resampled[team2_col] = fill_team_scores(df[team2_col])[source_rows]
+    resampled[ELAPSED_COL] = grid
+    print(f"Resampled {len(df)} samples onto {len(resampled)} points every {resample_interval}s")
+    df = resampled
+    
+    # Step 4: Fix unrealistic jumps (adjust the threshold as needed)
+    max_jump = MAX_REASONABLE_JUMP * resample_interval
     
-    # Function to smooth a single team's scores
     def smooth_team_scores(scores):
         smoothed = scores.copy()
-        last_valid_score = 0
-        
-        # First pass: Fix missing values and ensure scores never decrease
-        for i in range(len(smoothed)):
-            if pd.isna(smoothed[i]):
-                smoothed[i] = last_valid_score
-            elif smoothed[i] < last_valid_score:
-                # Score decreased, which is impossible - keep last valid score
-                smoothed[i] = last_valid_score
-            else:
-                last_valid_score = smoothed[i]
-        
-        # Second pass: Fix unrealistic jumps (adjust the threshold as needed)
-        MAX_REASONABLE_JUMP = 10  # Maximum reasonable score jump in a single time unit
-        
         for i in range(1, len(smoothed)):
             jump = smoothed[i] - smoothed[i-1]
-            if jump > MAX_REASONABLE_JUMP:
+            if jump > max_jump:
                 # Large jump detected, smooth it out
-                smoothed[i] = smoothed[i-1] + min(jump, MAX_REASONABLE_JUMP)
-        
+                smoothed[i] = smoothed[i-1] + max_jump
         return smoothed
     
     # Apply smoothing to both teams
     if team1_col:
-        df[team1_col] = smooth_team_scores(df[team1_col].values)
+        df[team1_col] = smooth_team_scores(df[team1_col].to_numpy(dtype=float))
     if team2_col:
-        df[team2_col] = smooth_team_scores(df[team2_col].values)
+        df[team2_col] = smooth_team_scores(df[team2_col].to_numpy(dtype=float))
     
     # Save cleaned data
     df.to_csv(output_file, index=False)
@@ -150,4 +169,8 @@ def clean_cod_hardpoint_data(input_file="score_log.csv", output_file="cleaned_sc
     print("You can run the visualization script to see the results: python visualize_scores.py")
 
 if __name__ == "__main__":
-    clean_cod_hardpoint_data()
+    # Pass a per-match file from matches/ to clean a single map from a long session
+    input_file = sys.argv[1] if len(sys.argv) > 1 else "score_log.csv"
+    output_file = sys.argv[2] if len(sys.argv) > 2 else "cleaned_score_log.csv"
+    resample_interval = float(sys.argv[3]) if len(sys.argv) > 3 else RESAMPLE_INTERVAL
+    clean_cod_hardpoint_data(input_file, output_file, resample_interval)
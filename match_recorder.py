@@ -0,0 +1,176 @@
+import csv
+import json
+import os
+import re
+import time
+from collections import deque
+from datetime import datetime
+
+WINNING_SCORE = 250
+RING_BUFFER_SIZE = 120  # Recent samples kept in memory (~2 minutes at 1 Hz)
+RESET_CONFIRM_SAMPLES = 3  # Consecutive 0,0 readings needed before a running match counts as reset
+CSV_HEADER = ["Timestamp", "Team 1 Score", "Team 2 Score"]
+
+_WALL_START = time.time()
+_MONOTONIC_START = time.perf_counter()
+
+
+def session_timestamp():
+    """
+    Current time as Unix epoch seconds with millisecond resolution.
+    Anchored to the wall clock once and advanced with a monotonic counter,
+    so samples never go backwards if the system clock is adjusted mid-session.
+    """
+    return round(_WALL_START + (time.perf_counter() - _MONOTONIC_START), 3)
+
+
+class MatchRecorder:
+    """
+    Streams tracker samples to disk and splits them into one file per match.
+
+    Every sample is appended to the raw log as it arrives. Match boundaries are
+    detected online: a 0,0 reading starts a match, RESET_CONFIRM_SAMPLES 0,0
+    readings in a row reset the current one if scores had already moved, and a
+    team reaching 250 ends it. Each match is
+    written to its own CSV in match_dir with a JSON sidecar holding the
+    tracker_config.json settings that were active when the match started.
+    The sidecar is written when the match opens and updated when it closes,
+    so a crashed session still leaves correct metadata behind.
+    Only the last buffer_size samples are kept in memory.
+    """
+
+    def __init__(self, raw_log="score_log.csv", match_dir="matches",
+                 config_file="tracker_config.json", buffer_size=RING_BUFFER_SIZE):
+        self.match_dir = match_dir
+        self.config_file = config_file
+        self.recent = deque(maxlen=buffer_size)
+
+        self._raw_file = open(raw_log, mode="w", newline="")
+        self._raw_writer = csv.writer(self._raw_file)
+        self._raw_writer.writerow(CSV_HEADER)
+
+        self._match_file = None
+        self._match_writer = None
+        self._match_meta = None
+        self.matches_written = []
+
+    @property
+    def in_match(self):
+        return self._match_file is not None
+
+    def record(self, timestamp, score1, score2):
+        """Store one sample (timestamp from session_timestamp()) and update match state. Scores may be None."""
+        self.recent.append((timestamp, score1, score2))
+        self._raw_writer.writerow([timestamp, score1, score2])
+        self._raw_file.flush()
+
+        if score1 == 0 and score2 == 0:
+            if not self.in_match:
+                self._open_match(timestamp)
+            elif self._scores_moved():
+                if self._zero_streak() < RESET_CONFIRM_SAMPLES:
+                    # Most likely a misread frame, keep the 0,0 out of the match file until confirmed
+                    self._write_sample(timestamp, None, None)
+                    return
+
+                zeros = list(self.recent)[-RESET_CONFIRM_SAMPLES:]
+                print(f"[{timestamp}] Score reset to 0-0, closing current match.")
+                self._close_match(zeros[0][0], "reset")
+                self._open_match(zeros[0][0])
+                for sample in zeros:
+                    self._write_sample(*sample)
+                return
+
+        if self.in_match:
+            self._write_sample(timestamp, score1, score2)
+
+    def _scores_moved(self):
+        return self._match_meta["team1_max"] > 0 or self._match_meta["team2_max"] > 0
+
+    def _zero_streak(self):
+        """Number of 0,0 readings at the end of the ring buffer."""
+        streak = 0
+        for _, score1, score2 in reversed(self.recent):
+            if score1 != 0 or score2 != 0:
+                break
+            streak += 1
+        return streak
+
+    def _write_sample(self, timestamp, score1, score2):
+        self._match_writer.writerow([timestamp, score1, score2])
+        self._match_file.flush()
+
+        meta = self._match_meta
+        meta["samples"] += 1
+        if score1 is not None:
+            meta["team1_max"] = max(meta["team1_max"], score1)
+        if score2 is not None:
+            meta["team2_max"] = max(meta["team2_max"], score2)
+
+        if score1 == WINNING_SCORE or score2 == WINNING_SCORE:
+            print(f"[{timestamp}] Winning score reached, closing match.")
+            self._close_match(timestamp, "winning_score")
+
+    def close(self):
+        """Finish any open match and close the raw log. Safe to call more than once."""
+        if self._raw_file.closed:
+            return
+        if self.in_match:
+            last_timestamp = self.recent[-1][0] if self.recent else None
+            self._close_match(last_timestamp, "stopped")
+        self._raw_file.close()
+
+    def _load_config(self):
+        try:
+            with open(self.config_file, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Warning: could not read {self.config_file}: {e}")
+            return {}
+
+    def _open_match(self, timestamp):
+        # Re-read the config at every match start so map changes between maps are picked up
+        config = self._load_config()
+        map_name = config.get("map_name", "Unknown Map")
+        safe_map = re.sub(r"[^A-Za-z0-9]+", "_", map_name).strip("_") or "map"
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        os.makedirs(self.match_dir, exist_ok=True)
+        match_index = len(self.matches_written) + 1
+        base = os.path.join(self.match_dir, f"match_{stamp}_{match_index:02d}_{safe_map}")
+        csv_path = f"{base}.csv"
+
+        self._match_file = open(csv_path, mode="w", newline="")
+        self._match_writer = csv.writer(self._match_file)
+        self._match_writer.writerow(CSV_HEADER)
+        self._match_meta = {
+            "csv_file": csv_path,
+            "meta_file": f"{base}.json",
+            "start": timestamp,
+            "end": None,
+            "end_reason": None,
+            "samples": 0,
+            "team1_max": 0,
+            "team2_max": 0,
+            "config": config,
+        }
+        self._write_meta()
+        print(f"[{timestamp}] Match start detected ({map_name}). Writing to {csv_path}")
+
+    def _write_meta(self):
+        with open(self._match_meta["meta_file"], "w") as f:
+            json.dump(self._match_meta, f, indent=4)
+
+    def _close_match(self, timestamp, reason):
+        meta = self._match_meta
+        meta["end"] = timestamp
+        meta["end_reason"] = reason
+        self._match_file.close()
+        self._write_meta()
+
+        print(f"Match saved to {meta['csv_file']} ({meta['samples']} samples, "
+              f"final {meta['team1_max']}-{meta['team2_max']}, {reason})")
+        self.matches_written.append(meta["csv_file"])
+        self._match_file = None
+        self._match_writer = None
+        self._match_meta = None
@@ -0,0 +1,323 @@
+import cv2
+import numpy as np
+import pyautogui
+import hashlib
+from abc import ABC, abstractmethod
+import json
+import platform
+import statistics
+import time
+from collections import Counter
+from datetime import datetime
+
+try:
+    import easyocr
+except ImportError:
+    easyocr = None
+
+try:
+    import pytesseract
+except ImportError:
+    pytesseract = None
+
+CACHE_FILE = "ocr_backend_cache.json"
+CALIBRATION_SAMPLES = 15    # Screenshots taken during calibration (2 crops each)
+CALIBRATION_WINDOW = 30     # Seconds the screenshots are spread over, so the score changes in between
+MIN_DISTINCT_CROPS = 6      # Fewer readable distinct crops than this and the result is not cached
+AGREEMENT_FLOOR = 0.9       # Minimum agreement with the consensus reading
+REFERENCE_BACKEND = "easyocr"  # Breaks ties when backends disagree
+MAX_SCORE = 250
+
+BACKENDS = {}
+
+
+def register_backend(cls):
+    """Class decorator adding an OCR backend to the registry under cls.name."""
+    BACKENDS[cls.name] = cls
+    return cls
+
+
+def preprocess(image):
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    padded = cv2.copyMakeBorder(gray, 10, 10, 10, 10, cv2.BORDER_CONSTANT, value=0)
+    return cv2.resize(padded, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
+
+
+class OCRBackend(ABC):
+    """
+    Interface for score recognizers. Subclasses set name, implement
+    is_available() without loading anything heavy, load() to create their
+    model, and read_digits() returning the digits found in a score crop.
+    A subclass missing read_digits() can't be instantiated.
+    """
+    name = None
+
+    @classmethod
+    def is_available(cls):
+        return False
+
+    def load(self):
+        pass
+
+    @abstractmethod
+    def read_digits(self, image):
+        pass
+
+
+@register_backend
+class EasyOCRBackend(OCRBackend):
+    name = "easyocr"
+    gpu = False
+
+    @classmethod
+    def is_available(cls):
+        return easyocr is not None
+
+    def load(self):
+        self.reader = easyocr.Reader(['en'], gpu=self.gpu)
+
+    def read_digits(self, image):
+        result = self.reader.readtext(preprocess(image), detail=1, paragraph=False)
+
+        digits = ''
+        for bbox, text, conf in result:
+            cleaned = ''.join(filter(str.isdigit, text))
+            if cleaned:
+                digits += cleaned
+        return digits
+
+
+@register_backend
+class EasyOCRGPUBackend(EasyOCRBackend):
+    name = "easyocr-gpu"
+    gpu = True
+
+    @classmethod
+    def is_available(cls):
+        if easyocr is None:
+            return False
+        try:
+            import torch
+            return torch.cuda.is_available()
+        except ImportError:
+            return False
+
+
+@register_backend
+class TesseractBackend(OCRBackend):
+    name = "tesseract"
+    config = '--oem 3 --psm 7 -c tessedit_char_whitelist=0123456789'
+
+    @classmethod
+    def is_available(cls):
+        if pytesseract is None:
+            return False
+        try:
+            pytesseract.get_tesseract_version()
+            return True
+        except Exception:
+            # pytesseract is installed but the tesseract binary is not
+            return False
+
+    def read_digits(self, image):
+        _, thresh = cv2.threshold(preprocess(image), 150, 255, cv2.THRESH_BINARY)
+        data = pytesseract.image_to_data(thresh, config=self.config, output_type=pytesseract.Output.DICT)
+
+        digits = []
+        for i in range(len(data['text'])):
+            text = data['text'][i].strip()
+            try:
+                conf = float(data['conf'][i])
+            except (TypeError, ValueError):
+                conf = -1
+            if text.isdigit() and conf > 35:
+                digits.append(text)
+        return ''.join(digits)
+
+
+def capture_score_crops(bbox):
+    """Take a screenshot and return the team 1 and team 2 score regions."""
+    screenshot = pyautogui.screenshot()
+    frame = np.array(screenshot)
+    frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+
+    team1 = bbox["team1"]
+    team2 = bbox["team2"]
+    team1_img = frame[team1["y"]:team1["y"]+team1["height"], team1["x"]:team1["x"]+team1["width"]]
+    team2_img = frame[team2["y"]:team2["y"]+team2["height"], team2["x"]:team2["x"]+team2["width"]]
+    return team1_img, team2_img
+
+
+def _is_plausible(reading):
+    return reading.isdigit() and int(reading) <= MAX_SCORE
+
+
+def _consensus(readings):
+    """Most common plausible reading across backends, or None if there is none."""
+    plausible = {name: r for name, r in readings.items() if _is_plausible(r)}
+    if not plausible:
+        return None
+    counts = Counter(plausible.values()).most_common()
+    top_count = counts[0][1]
+    tied = [reading for reading, count in counts if count == top_count]
+    if len(tied) > 1 and plausible.get(REFERENCE_BACKEND) in tied:
+        return plausible[REFERENCE_BACKEND]
+    return tied[0]
+
+
+def unique_crops(crops):
+    """Drop crops that are pixel-for-pixel identical, a static scoreboard only counts once."""
+    seen = set()
+    unique = []
+    for crop in crops:
+        key = (crop.shape, hashlib.sha1(crop.tobytes()).hexdigest())
+        if key not in seen:
+            seen.add(key)
+            unique.append(crop)
+    return unique
+
+
+def calibrate(backends, crops, agreement_floor=AGREEMENT_FLOOR):
+    """
+    Run every crop through every loaded backend and pick the fastest one whose
+    agreement with the consensus reading is at least agreement_floor. Falls
+    back to the most agreeing backend if none meets the floor.
+
+    There is no ground truth, so this measures agreement, not accuracy. The
+    consensus is the majority reading, and ties go to REFERENCE_BACKEND. With
+    only two backends every disagreement is a tie, so the measure is simply
+    agreement with EasyOCR (which always scores 100%).
+    Returns (chosen backend name, per-backend results, number of crops scored).
+    """
+    readings = [{} for _ in crops]
+    latencies = {name: [] for name in backends}
+
+    for name, backend in backends.items():
+        backend.read_digits(crops[0])  # Warm-up, first call is often much slower
+        for i, crop in enumerate(crops):
+            start = time.perf_counter()
+            readings[i][name] = backend.read_digits(crop)
+            latencies[name].append(time.perf_counter() - start)
+
+    consensus = [_consensus(r) for r in readings]
+    scored = [i for i, c in enumerate(consensus) if c is not None]
+
+    results = {}
+    for name in backends:
+        agree = sum(1 for i in scored if readings[i][name] == consensus[i])
+        results[name] = {
+            "latency_ms": round(statistics.median(latencies[name]) * 1000, 2),
+            "agreement": round(agree / len(scored), 3) if scored else 0.0,
+        }
+
+    eligible = [name for name in results if results[name]["agreement"] >= agreement_floor]
+    if eligible:
+        chosen = min(eligible, key=lambda name: results[name]["latency_ms"])
+    else:
+        if scored:
+            print(f"Warning: no OCR backend reached {agreement_floor:.0%} agreement, using the most agreeing one.")
+        chosen = max(results, key=lambda name: (results[name]["agreement"], -results[name]["latency_ms"]))
+    return chosen, results, len(scored)
+
+
+def _cache_key(bbox, available):
+    # Same machine, same score regions and same installed backends => same decision
+    machine = [platform.node(), platform.machine(), platform.processor(), platform.python_version()]
+    payload = json.dumps({"machine": machine, "bbox": bbox, "backends": sorted(available)}, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _load_cache(cache_file):
+    try:
+        with open(cache_file, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Warning: could not read {cache_file}, ignoring it: {e}")
+        return {}
+
+
+def _available_backends():
+    available = [name for name, cls in BACKENDS.items() if cls.is_available()]
+    if not available:
+        raise RuntimeError("No OCR backend available. Install easyocr, or pytesseract and the Tesseract binary.")
+    return available
+
+
+def _load_backend(name):
+    print(f"Loading OCR backend '{name}'...")
+    backend = BACKENDS[name]()
+    backend.load()
+    return backend
+
+
+def select_backend(bbox, cache_file=CACHE_FILE):
+    """
+    Return a loaded OCR backend for this machine and bounding box config.
+
+    Uses the choice cached by calibrate_backends() when there is one, and
+    REFERENCE_BACKEND (or the only installed backend) otherwise. Never
+    calibrates itself, so tracking starts straight away.
+    """
+    available = _available_backends()
+    key = _cache_key(bbox, available)
+    cache = _load_cache(cache_file)
+
+    if key in cache and cache[key]["backend"] in available:
+        name = cache[key]["backend"]
+        print(f"Using cached OCR backend '{name}' (calibrated {cache[key]['calibrated_at']}).")
+        return _load_backend(name)
+
+    name = REFERENCE_BACKEND if REFERENCE_BACKEND in available else available[0]
+    if len(available) > 1:
+        print(f"OCR backends not calibrated for this machine, using '{name}'. "
+              f"Run the tracker with --calibrate during a live match to pick the fastest one.")
+    return _load_backend(name)
+
+
+def calibrate_backends(bbox, cache_file=CACHE_FILE, samples=CALIBRATION_SAMPLES):
+    """
+    Benchmark every available backend and cache the choice for select_backend().
+
+    Screenshots are taken over CALIBRATION_WINDOW seconds and every backend
+    reads the distinct score crops. Nothing is recorded meanwhile, so this is
+    a separate step to run while a match (live or replay) is on screen. The
+    decision is only cached if enough distinct readable crops were seen.
+    Returns True if a choice was cached.
+    """
+    available = _available_backends()
+    if len(available) == 1:
+        print(f"Only '{available[0]}' is installed, nothing to calibrate.")
+        return False
+
+    backends = {name: _load_backend(name) for name in available}
+
+    print(f"Calibrating OCR backends on {samples} screenshots over {CALIBRATION_WINDOW}s, keep a live match on screen...")
+    crops = []
+    for i in range(samples):
+        crops.extend(capture_score_crops(bbox))
+        if i < samples - 1:
+            time.sleep(CALIBRATION_WINDOW / (samples - 1))
+    crops = unique_crops(crops)
+    name, results, scored = calibrate(backends, crops)
+    print(f"  {len(crops)} distinct crops, {scored} readable")
+    for backend_name, r in results.items():
+        print(f"  {backend_name}: {r['latency_ms']} ms/crop, {r['agreement']:.0%} agreement")
+
+    if scored < MIN_DISTINCT_CROPS:
+        # Scoreboard missing or not changing (e.g. pre-game), too little evidence to remember this choice
+        print(f"Warning: fewer than {MIN_DISTINCT_CROPS} distinct readable scores during calibration, nothing was cached. "
+              f"Run it again while the score is changing.")
+        return False
+
+    print(f"Selected OCR backend '{name}'.")
+    cache = _load_cache(cache_file)
+    cache[_cache_key(bbox, available)] = {
+        "backend": name,
+        "results": results,
+        "calibrated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    with open(cache_file, "w") as f:
+        json.dump(cache, f, indent=4)
+    return True
@@ -0,0 +1,92 @@
+import numpy as np
+
+ELAPSED_COL = "Elapsed Seconds"  # Written by data_cleansing.py, seconds since match start
+
+
+def point_budget(fig_width, dpi, points_per_pixel=1.0):
+    """
+    Number of points worth drawing for a figure fig_width inches wide at dpi.
+    More points than horizontal pixels can't be seen, they only slow down rendering.
+    """
+    return max(3, int(fig_width * dpi * points_per_pixel))
+
+
+def elapsed_axis(df):
+    """
+    Seconds since match start for each row. Uses the elapsed column written by
+    data_cleansing.py, older cleaned files fall back to one row per second.
+    """
+    if ELAPSED_COL in df.columns:
+        return df[ELAPSED_COL].to_numpy(dtype=float)
+    return np.arange(len(df), dtype=float)
+
+
+def marker_indices(x, interval):
+    """Row index of the latest sample at or before every multiple of interval seconds."""
+    if len(x) == 0:
+        return np.array([], dtype=int)
+    marker_times = np.arange(x[0], x[-1] + interval / 1000, interval)
+    return np.unique(np.searchsorted(x, marker_times, side="right") - 1)
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Returns the indices of n_out points that keep the visual shape of (x, y).
+    The first and last points are always kept. Since only real samples are
+    picked, a score series that never decreases stays that way when drawn.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Bucket boundaries for the n_out - 2 middle buckets covering [1, n - 1)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+
+    indices = np.empty(n_out, dtype=int)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+
+        # Average of the next bucket (or the last point for the final bucket)
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        areas = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(np.nan_to_num(areas)))
+        indices[i + 1] = a
+
+    return indices
+
+
+def downsample_series(x, y, n_out, keep_indices=None):
+    """
+    Downsample (x, y) to about n_out points with LTTB.
+
+    Indices in keep_indices (e.g. the 60 second hill markers) are always kept
+    so that markers sit exactly on the drawn line.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    indices = lttb_indices(x, y, n_out)
+
+    if keep_indices is not None and len(keep_indices):
+        keep = np.asarray(keep_indices, dtype=int)
+        keep = keep[(keep >= 0) & (keep < len(x))]
+        indices = np.union1d(indices, keep)
+
+    return x[indices], y[indices]
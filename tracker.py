@@ -1,109 +1,55 @@
-import cv2
-import pytesseract
-import pyautogui
 import time
-import numpy as np
-import csv
+import sys
 import json
 from datetime import datetime
-import easyocr
+from match_recorder import MatchRecorder, session_timestamp
+from ocr_backends import select_backend, calibrate_backends, capture_score_crops
+
+SAMPLE_INTERVAL = 1.0  # Seconds between screenshots, lower values sample faster
 
 # Load bounding boxes
 with open("bbox_config.json", "r") as f:
     bbox = json.load(f)
 
-team1 = bbox["team1"]
-team2 = bbox["team2"]
-
-team1_scores = []
-team2_scores = []
-timestamps = []
-
-reader = easyocr.Reader(['en'], gpu=False)  # Set gpu=True if you have a compatible GPU
-
-def extract_score_easyocr(image, team_name, timestamp):
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    padded = cv2.copyMakeBorder(gray, 10, 10, 10, 10, cv2.BORDER_CONSTANT, value=0)
-    resized = cv2.resize(padded, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
-
-    result = reader.readtext(resized, detail=1, paragraph=False)
-
-    digits = ''
-    for bbox, text, conf in result:
-        cleaned = ''.join(filter(str.isdigit, text))
-        if cleaned:
-            digits += cleaned
-
-    print(f"[DEBUG][EasyOCR] Extracted: {digits}")
-    return digits
-
-def extract_score(image, team_name, timestamp):
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    padded = cv2.copyMakeBorder(gray, 10, 10, 10, 10, cv2.BORDER_CONSTANT, value=0)
-    resized = cv2.resize(padded, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
-    _, thresh = cv2.threshold(resized, 150, 255, cv2.THRESH_BINARY)
-
-    # Save debug view
-    #debug_filename = f"debug_scores/{team_name}_{timestamp.replace(':', '-')}.png"
-    # cv2.imwrite(debug_filename, thresh)
-
-    # Use image_to_data to get character-wise boxes
-    config = '--oem 3 --psm 7 -c tessedit_char_whitelist=0123456789'
-    data = pytesseract.image_to_data(thresh, config=config, output_type=pytesseract.Output.DICT)
-
-    digits = []
-    for i in range(len(data['text'])):
-        text = data['text'][i].strip()
-        try:
-            conf = float(data['conf'][i])
-        except:
-            conf = -1
-        if text.isdigit() and conf > 35:
-            digits.append(text)
-
-    joined = ''.join(digits)
-    print(f"[DEBUG] OCR extracted pieces for {team_name}: {digits} => '{joined}'")
-    return joined
-
+if "--calibrate" in sys.argv:
+    # Separate step: benchmark the OCR backends on a match on screen, then exit without recording
+    calibrate_backends(bbox)
+    sys.exit(0)
 
+# Uses the backend picked by --calibrate for this machine, EasyOCR if it was never calibrated
+ocr = select_backend(bbox)
 
+recorder = MatchRecorder()
 
 try:
     print("Starting score tracking... Press Ctrl+C to stop.")
     while True:
-        screenshot = pyautogui.screenshot()
-        frame = np.array(screenshot)
-        frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-
-        # Crop regions
-        team1_img = frame[team1["y"]:team1["y"]+team1["height"], team1["x"]:team1["x"]+team1["width"]]
-        team2_img = frame[team2["y"]:team2["y"]+team2["height"], team2["x"]:team2["x"]+team2["width"]]
+        team1_img, team2_img = capture_score_crops(bbox)
 
 
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        score1 = extract_score_easyocr(team1_img, "team1", timestamp)
-        score2 = extract_score_easyocr(team2_img, "team2", timestamp)
+        timestamp = session_timestamp()
+        time_label = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+        score1 = ocr.read_digits(team1_img)
+        score2 = ocr.read_digits(team2_img)
+        print(f"[DEBUG][{ocr.name}] Extracted: {score1} / {score2}")
 
 
         score1_val = int(score1) if score1.isdigit() else None
         score2_val = int(score2) if score2.isdigit() else None
 
-        
-        timestamps.append(timestamp)
-        team1_scores.append(score1_val)
-        team2_scores.append(score2_val)
 
-        print(f"[{timestamp}] Team 1: {score1_val}, Team 2: {score2_val}")
+        recorder.record(timestamp, score1_val, score2_val)
 
-        time.sleep(1)
+        print(f"[{time_label}] Team 1: {score1_val}, Team 2: {score2_val}")
 
-except KeyboardInterrupt:
-    print("\nStopped tracking. Saving results to 'score_log.csv'...")
+        # Keep a steady sample rate regardless of how long OCR took
+        time.sleep(max(0.0, SAMPLE_INTERVAL - (session_timestamp() - timestamp)))
 
-    with open("score_log.csv", mode="w", newline="") as file:
-        writer = csv.writer(file)
-        writer.writerow(["Timestamp", "Team 1 Score", "Team 2 Score"])
-        for i in range(len(timestamps)):
-            writer.writerow([timestamps[i], team1_scores[i], team2_scores[i]])
+except KeyboardInterrupt:
+    print("\nStopped tracking.")
 
-    print("Saved.")
+finally:
+    # Also runs if OCR or the screenshot fails, so the open match file is finished properly
+    print("Closing 'score_log.csv' and any open match file...")
+    recorder.close()
+    print(f"Saved. {len(recorder.matches_written)} match file(s) written to '{recorder.match_dir}/'.")
@@ -5,6 +5,12 @@ import sys
 import os
 from datetime import datetime
 
+from render_prep import point_budget, downsample_series, elapsed_axis
+
+BASIC_FIG_SIZE = (12, 6)
+ADVANCED_FIG_SIZE = (14, 8)
+DPI = 300
+
 def apply_custom_styling(ax, fig, team1_name, team2_name, map_name, team1_color, team2_color):
     import numpy as np
     import matplotlib.pyplot as plt
@@ -74,12 +80,15 @@ def visualize_cod_scores(input_file="cleaned_score_log.csv", output_file="score_
     
     print(f"Using columns: Timestamp={timestamp_col}, Team1={team1_col}, Team2={team2_col}")
     
+    x_array = elapsed_axis(df)
+
     # Create basic line chart
-    plt.figure(figsize=(12, 6))
+    plt.figure(figsize=BASIC_FIG_SIZE)
+    budget = point_budget(BASIC_FIG_SIZE[0], DPI)
     if team1_col:
-        plt.plot(df[team1_col], label='Team 1', linewidth=2)
+        plt.plot(*downsample_series(x_array, df[team1_col].values, budget), label='Team 1', linewidth=2)
     if team2_col:
-        plt.plot(df[team2_col], label='Team 2', linewidth=2)
+        plt.plot(*downsample_series(x_array, df[team2_col].values, budget), label='Team 2', linewidth=2)
     
     plt.title('Call of Duty Hardpoint Score Progression', fontsize=16)
     plt.xlabel('Time (seconds)', fontsize=12)
@@ -96,20 +105,21 @@ def visualize_cod_scores(input_file="cleaned_score_log.csv", output_file="score_
     
     # Save basic visualization
     plt.tight_layout()
-    plt.savefig(output_file, dpi=300)
+    plt.savefig(output_file, dpi=DPI)
     print(f"Basic score progression plot saved to {output_file}")
     
     # Try to create an advanced visualization if possible
     try:
         # Create a more detailed visualization with timestamps
-        plt.figure(figsize=(14, 8))
+        plt.figure(figsize=ADVANCED_FIG_SIZE)
         
         # Main score plot
         ax1 = plt.subplot(211)
+        budget = point_budget(ADVANCED_FIG_SIZE[0], DPI)
         if team1_col:
-            ax1.plot(df[team1_col], 'b-', label='Team 1', linewidth=2)
+            ax1.plot(*downsample_series(x_array, df[team1_col].values, budget), 'b-', label='Team 1', linewidth=2)
         if team2_col:
-            ax1.plot(df[team2_col], 'r-', label='Team 2', linewidth=2)
+            ax1.plot(*downsample_series(x_array, df[team2_col].values, budget), 'r-', label='Team 2', linewidth=2)
         
         ax1.set_title('Call of Duty Hardpoint Score Progression', fontsize=16)
         ax1.set_ylabel('Score', fontsize=12)
@@ -119,8 +129,8 @@ def visualize_cod_scores(input_file="cleaned_score_log.csv", output_file="score_
         # Score difference plot
         if team1_col and team2_col:
             ax2 = plt.subplot(212, sharex=ax1)
-            score_diff = df[team1_col] - df[team2_col]
-            ax2.plot(score_diff, 'g-', label='Team 1 - Team 2', linewidth=2)
+            diff_x, score_diff = downsample_series(x_array, (df[team1_col] - df[team2_col]).values, budget)
+            ax2.plot(diff_x, score_diff, 'g-', label='Team 1 - Team 2', linewidth=2)
             ax2.axhline(y=0, color='k', linestyle='-', alpha=0.3)
             ax2.set_xlabel('Time (seconds)', fontsize=12)
             ax2.set_ylabel('Score Difference', fontsize=12)
@@ -128,14 +138,14 @@ def visualize_cod_scores(input_file="cleaned_score_log.csv", output_file="score_
             ax2.grid(True, alpha=0.3)
             
             # Fill above/below zero line
-            ax2.fill_between(range(len(score_diff)), score_diff, 0, 
+            ax2.fill_between(diff_x, score_diff, 0, 
                             where=(score_diff > 0), color='green', alpha=0.3)
-            ax2.fill_between(range(len(score_diff)), score_diff, 0, 
+            ax2.fill_between(diff_x, score_diff, 0, 
                             where=(score_diff < 0), color='red', alpha=0.3)
         
         plt.tight_layout()
         advanced_file = f"advanced_{output_file}"
-        plt.savefig(advanced_file, dpi=300)
+        plt.savefig(advanced_file, dpi=DPI)
         print(f"Advanced visualization saved to {advanced_file}")
         
     except Exception as e:
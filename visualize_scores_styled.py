@@ -4,16 +4,12 @@ import matplotlib.pyplot as plt
 import sys
 import json
 
-from scipy.interpolate import make_interp_spline
+from render_prep import point_budget, downsample_series, elapsed_axis, marker_indices
 
-def smooth_line(x, y, points=300):
-    x_new = np.linspace(x.min(), x.max(), points)
-    spline = make_interp_spline(x, y, k=5)
-    y_new = spline(x_new)
-    return x_new, y_new
+FIG_SIZE = (12.8, 7.2)  # 16:9 aspect ratio sized for 1920x1080 at 150 DPI
 
 
-def apply_custom_styling(ax, fig, team1_name, team2_name, map_name, team1_color, team2_color, map_number, hill_duration, rotation_length):
+def apply_custom_styling(ax, fig, team1_name, team2_name, map_name, team1_color, team2_color, map_number, hill_duration, rotation_length, subtitle=None):
     # Set dark style with clean grey background
     plt.style.use('dark_background')
     fig.patch.set_facecolor('#262626')  # Darker grey for figure background
@@ -38,7 +34,9 @@ def apply_custom_styling(ax, fig, team1_name, team2_name, map_name, team1_color,
     
     # Title and subtitle
     fig.text(0.05, 0.91, 'GAME FLOW', color='white', fontsize=24, fontweight='bold')
-    fig.text(0.71, 0.92, f'MAP {map_number} - HARDPOINT: {map_name.upper()}', color='white', fontsize=14)
+    if subtitle is None:
+        subtitle = f'MAP {map_number} - HARDPOINT: {map_name.upper()}'
+    fig.text(0.71, 0.92, subtitle, color='white', fontsize=14)
 
     # Legend
     legend_elements = [
@@ -80,6 +78,9 @@ def visualize_cod_scores(
         print(f"Error reading config file: {e}")
         return
     
+    # A match's .json file from matches/ holds the config snapshot under "config"
+    config = config.get("config", config)
+    
     map_name = config.get("map_name", "Unknown Map")
     map_settings = config.get("map_settings", {})
     map_info = map_settings.get(map_name, {})
@@ -104,36 +105,37 @@ def visualize_cod_scores(
     print(f"Using columns: Timestamp={timestamp_col}, Team1={team1_col}, Team2={team2_col}")
 
     # Create figure sized appropriately for 1920x1080 broadcast
-    fig, ax = plt.subplots(figsize=(12.8, 7.2))  # 16:9 aspect ratio sized for 1920x1080 at 150 DPI
-    x_data = range(len(df))
-    
-    # For finding points at 60 second intervals
-    interval_points = np.arange(0, len(df), 60)
+    fig, ax = plt.subplots(figsize=FIG_SIZE)
+    x_array = elapsed_axis(df)
     
-    x_array = np.array(x_data)
+    # Rows at each hill boundary, based on real elapsed time
+    interval_points = marker_indices(x_array, hill_duration)
+
+    # Never draw more points than the output has horizontal pixels
+    budget = point_budget(FIG_SIZE[0], dpi)
 
     if team1_col:
         y1 = df[team1_col].values
-        x_smooth, y_smooth = smooth_line(x_array, y1)
-        ax.plot(x_smooth, y_smooth, linewidth=3, color=team1_color, label=team1_name)
-        ax.plot(interval_points, df.iloc[interval_points][team1_col], 'o', color=team1_color, 
+        x_line, y_line = downsample_series(x_array, y1, budget, keep_indices=interval_points)
+        ax.plot(x_line, y_line, linewidth=3, color=team1_color, label=team1_name)
+        ax.plot(x_array[interval_points], df.iloc[interval_points][team1_col], 'o', color=team1_color, 
             markersize=8, markeredgecolor='black', markeredgewidth=1)
 
     if team2_col:
         y2 = df[team2_col].values
-        xsmooth, y_smooth = smooth_line(x_array, y2)
-        ax.plot(x_smooth, y_smooth, linewidth=3, color=team2_color, label=team2_name)
-        ax.plot(interval_points, df.iloc[interval_points][team2_col], 'o', color=team2_color, 
+        x_line, y_line = downsample_series(x_array, y2, budget, keep_indices=interval_points)
+        ax.plot(x_line, y_line, linewidth=3, color=team2_color, label=team2_name)
+        ax.plot(x_array[interval_points], df.iloc[interval_points][team2_col], 'o', color=team2_color, 
             markersize=8, markeredgecolor='black', markeredgewidth=1)
 
     # Set x-axis limits to avoid padding
-    ax.set_xlim(left=0, right=len(df) - 1)
+    ax.set_xlim(left=0, right=x_array[-1])
 
     apply_custom_styling(ax, fig, team1_name, team2_name, map_name, team1_color, team2_color, map_number, hill_duration, rotation_length)
     
     # No need for tight_layout since we're using subplots_adjust in apply_custom_styling
     plt.savefig(output_file, dpi=dpi)
-    print(f"Styled score progression plot saved to {output_file} at {dpi} DPI (approx. {int(12.8*dpi)}x{int(7.2*dpi)} pixels)")
+    print(f"Styled score progression plot saved to {output_file} at {dpi} DPI (approx. {int(FIG_SIZE[0]*dpi)}x{int(FIG_SIZE[1]*dpi)} pixels)")
 
 if __name__ == "__main__":
     input_file = sys.argv[1] if len(sys.argv) > 1 else "cleaned_score_log.csv"
@@ -0,0 +1,242 @@
+import pandas as pd
+import numpy as np
+import matplotlib.pyplot as plt
+import argparse
+import glob
+import hashlib
+import json
+import os
+
+from data_cleansing import clean_cod_hardpoint_data
+from render_prep import elapsed_axis, ELAPSED_COL
+from visualize_scores_styled import apply_custom_styling, FIG_SIZE
+
+CACHE_DIR = "season_cache"
+SAMPLES_PER_HILL = 60  # Grid resolution of the normalized time axis
+PERCENTILES = (10, 25, 75, 90)
+
+
+def load_match_meta(csv_file, default_config):
+    """
+    Config for a match: the JSON file written next to it by the tracker
+    (see match_recorder.py), or default_config if there is none. Cleaned
+    files (matches/cleaned/<match>_cleaned.csv) use the raw match's file.
+    """
+    base = os.path.splitext(csv_file)[0]
+    meta_file = base + ".json"
+    if not os.path.exists(meta_file) and base.endswith("_cleaned"):
+        # Written by cleanse_and_visualize_data.py one directory below the raw match
+        name = os.path.basename(base)[:-len("_cleaned")]
+        meta_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(csv_file))), name + ".json")
+    try:
+        with open(meta_file, "r") as f:
+            return json.load(f).get("config", default_config)
+    except FileNotFoundError:
+        return default_config
+    except Exception as e:
+        print(f"Warning: could not read {meta_file}: {e}")
+        return default_config
+
+
+def hill_settings(config):
+    map_name = config.get("map_name", "Unknown Map")
+    map_info = config.get("map_settings", {}).get(map_name, {})
+    hill_duration = map_info.get("hill_duration", config.get("hill_duration", 60))
+    rotation_length = map_info.get("rotation_length", 4)
+    return hill_duration, rotation_length
+
+
+def _cache_path(csv_file, hill_duration, cache_dir):
+    stat = os.stat(csv_file)
+    key = f"{os.path.abspath(csv_file)}|{stat.st_mtime_ns}|{stat.st_size}|{hill_duration}|{SAMPLES_PER_HILL}"
+    return os.path.join(cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".npz")
+
+
+def load_match_arrays(csv_file, hill_duration, cache_dir=CACHE_DIR):
+    """
+    Team 1 and team 2 scores of one match on a time grid normalized to hills
+    (SAMPLES_PER_HILL points per hill). Raw match files are cleaned first.
+    Results are cached as .npz files so each match is only parsed once.
+    Returns (team1, team2) float arrays, or None if the match can't be read.
+    """
+    if not os.path.isfile(csv_file):
+        print(f"Error reading {csv_file}: file not found")
+        return None
+
+    os.makedirs(cache_dir, exist_ok=True)
+    cache_file = _cache_path(csv_file, hill_duration, cache_dir)
+    if os.path.exists(cache_file):
+        with np.load(cache_file) as cached:
+            return cached["team1"], cached["team2"]
+
+    try:
+        df = pd.read_csv(csv_file)
+    except Exception as e:
+        print(f"Error reading {csv_file}: {e}")
+        return None
+
+    if ELAPSED_COL not in df.columns:
+        # Raw match file from the tracker, clean it once into the cache
+        cleaned_file = os.path.splitext(cache_file)[0] + ".csv"
+        clean_cod_hardpoint_data(csv_file, cleaned_file, backup=False)
+        try:
+            df = pd.read_csv(cleaned_file)
+        except Exception as e:
+            print(f"Error cleaning {csv_file}: {e}")
+            return None
+        os.remove(cleaned_file)
+
+    cols = df.columns.tolist()
+    if len(cols) < 3 or df.empty:
+        print(f"Skipping {csv_file}: no score columns")
+        return None
+
+    hills = elapsed_axis(df) / hill_duration
+    grid = np.arange(0, hills[-1] + 0.5 / SAMPLES_PER_HILL, 1 / SAMPLES_PER_HILL)
+    rows = np.searchsorted(hills, grid, side="right") - 1
+    team1 = df[cols[1]].to_numpy(dtype=float)[rows]
+    team2 = df[cols[2]].to_numpy(dtype=float)[rows]
+
+    np.savez(cache_file, team1=team1, team2=team2)
+    return team1, team2
+
+
+def differential(arrays, config, team):
+    """Score differential from team's point of view (team 1's if team is None)."""
+    team1, team2 = arrays
+    if team and config.get("team2", {}).get("name", "").lower() == team.lower():
+        return team2 - team1
+    return team1 - team2
+
+
+def stack_matches(curves):
+    """
+    Matches x time matrix. A match that ended early keeps its final
+    differential, so the aggregate is over every match at every point
+    instead of drifting towards the close matches that are still going.
+    """
+    length = max(len(c) for c in curves)
+    matrix = np.empty((len(curves), length))
+    for i, curve in enumerate(curves):
+        matrix[i, :len(curve)] = curve
+        matrix[i, len(curve):] = curve[-1]
+    return matrix
+
+
+def visualize_season(
+    input_pattern="matches/*.csv",
+    output_file="season_overlay.png",
+    config_file="tracker_config.json",
+    map_filter=None,
+    team_filter=None,
+    highlight_file=None,
+    dpi=150
+):
+    try:
+        with open(config_file, 'r') as f:
+            default_config = json.load(f)
+    except Exception as e:
+        print(f"Error reading config file: {e}")
+        return
+
+    files = sorted(f for f in glob.glob(input_pattern) if f.endswith(".csv"))
+    print(f"Found {len(files)} match files matching {input_pattern}")
+
+    team1 = default_config.get("team1", {})
+    team2 = default_config.get("team2", {})
+    # Without --team, orient by the config's team 1 so each curve is from the same team's side
+    focus = team_filter or team1.get("name", "Team 1")
+
+    matches = []
+    rotation_lengths = set()
+    for csv_file in files:
+        config = load_match_meta(csv_file, default_config)
+        map_name = config.get("map_name", "Unknown Map")
+        team_names = [config.get(t, {}).get("name", "").lower() for t in ("team1", "team2")]
+
+        if map_filter and map_name.lower() != map_filter.lower():
+            continue
+        if team_filter and team_filter.lower() not in team_names:
+            continue
+
+        hill_duration, match_rotation = hill_settings(config)
+        arrays = load_match_arrays(csv_file, hill_duration)
+        if arrays is None:
+            continue
+        matches.append((arrays, config, focus.lower() in team_names))
+        rotation_lengths.add(match_rotation)
+
+    if not matches:
+        print("No matches found for the given filters.")
+        return
+
+    if not all(plays for _, _, plays in matches):
+        # Only possible without --team: some matches don't have the config's team 1, compare slots instead
+        missing = sum(1 for _, _, plays in matches if not plays)
+        print(f"Warning: {focus} did not play {missing} of {len(matches)} matches, showing the team 1 slot's differential. "
+              f"Use --team to follow one team.")
+        focus = None
+    curves = [differential(arrays, config, focus) for arrays, config, _ in matches]
+
+    matrix = stack_matches(curves)
+    mean_curve = matrix.mean(axis=0)
+    p10, p25, p75, p90 = np.percentile(matrix, PERCENTILES, axis=0)
+    x = np.arange(matrix.shape[1]) / SAMPLES_PER_HILL
+    print(f"Aggregated {len(curves)} matches over {x[-1]:.1f} hills")
+
+    average_color = team1.get("color", "#FF8C42")
+    highlight_color = team2.get("color", "white")
+
+    fig, ax = plt.subplots(figsize=FIG_SIZE)
+    ax.fill_between(x, p10, p90, color=average_color, alpha=0.15, linewidth=0)
+    ax.fill_between(x, p25, p75, color=average_color, alpha=0.3, linewidth=0)
+    ax.plot(x, mean_curve, linewidth=3, color=average_color)
+    ax.axhline(0, color='white', linewidth=1, alpha=0.5)
+
+    highlight_label = "NO HIGHLIGHTED MATCH"
+    drawn = [p10, p90]
+    x_end = x[-1]
+    if highlight_file:
+        config = load_match_meta(highlight_file, default_config)
+        hill_duration, _ = hill_settings(config)
+        arrays = load_match_arrays(highlight_file, hill_duration)
+        if arrays is not None:
+            highlight = differential(arrays, config, focus)
+            ax.plot(np.arange(len(highlight)) / SAMPLES_PER_HILL, highlight, linewidth=3, color=highlight_color)
+            drawn.append(highlight)
+            x_end = max(x_end, (len(highlight) - 1) / SAMPLES_PER_HILL)
+            highlight_label = os.path.splitext(os.path.basename(highlight_file))[0]
+
+    ax.set_xlim(left=0, right=x_end)
+    title_map = map_filter or "ALL MAPS"
+    # hill_duration=1 since the x-axis is already in hills
+    # Ticks are labeled P1, P2, ... when every match shares a rotation, by hill number otherwise
+    rotation_length = rotation_lengths.pop() if len(rotation_lengths) == 1 else None
+    if rotation_length is None:
+        print("Warning: matches use different hill rotations, labeling ticks by hill number. Use --map to get P1, P2, ... labels.")
+    apply_custom_styling(ax, fig, f"{focus or 'Team 1 slot'} average differential", highlight_label, title_map, average_color, highlight_color,
+                         None, 1, rotation_length or 1, subtitle=f'{title_map.upper()} - {len(curves)} MATCHES')
+    if rotation_length is None:
+        ax.set_xticklabels([f'H{i + 1}' for i in range(len(ax.get_xticks()))], fontsize=10, color='white')
+
+    # Differential can be negative, override the 0-250 score axis. Size it so the highlighted match fits too
+    limit = max(50, int(np.ceil(max(np.max(np.abs(curve)) for curve in drawn) / 50)) * 50)
+    ax.set_ylim(-limit, limit)
+    ax.set_yticks(np.arange(-limit, limit + 1, 50))
+
+    plt.savefig(output_file, dpi=dpi)
+    print(f"Season overlay saved to {output_file}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Overlay the game flow of many Hardpoint matches.")
+    parser.add_argument("input_pattern", nargs="?", default="matches/*.csv", help="Glob of match CSV files (raw or cleaned)")
+    parser.add_argument("output_file", nargs="?", default="season_overlay.png")
+    parser.add_argument("config_file", nargs="?", default="tracker_config.json")
+    parser.add_argument("--map", dest="map_filter", help="Only include matches on this map")
+    parser.add_argument("--team", dest="team_filter", help="Only include matches of this team, differential from its side")
+    parser.add_argument("--highlight", dest="highlight_file", help="Match CSV to draw on top of the aggregate")
+    args = parser.parse_args()
+
+    visualize_season(args.input_pattern, args.output_file, args.config_file,
+                     args.map_filter, args.team_filter, args.highlight_file)